@@ -10,26 +10,42 @@ Script complet pour télécharger et créer un miroir hors ligne de cahier-de-pr
 import os
 import sys
 import time
-import json
 import getpass
+import html
+import queue
+import random
 import re
-import shutil
+import sqlite3
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import unquote
 from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.firefox.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 
 # Configuration
 OUTPUT_DIR = Path.home() / "cahier_prepa_offline"
 OUTPUT_DIR_TEST = Path.home() / "cahier_prepa_test"  # Dossier séparé pour les tests
-DOWNLOAD_DIR = Path.home() / "Téléchargements"
-WAIT_TIME = 2  # Secondes entre les téléchargements
+REQUEST_INTERVAL = 0.15  # Secondes minimum entre deux requêtes HTTP
+REQUEST_JITTER = 0.05  # Variation aléatoire ajoutée à l'intervalle
+DOWNLOAD_WORKERS = 8  # Téléchargements de fichiers en parallèle
+EXPLORE_WORKERS = 2  # Navigateurs explorant les répertoires en parallèle (4 au maximum)
+HEADLESS = True  # Firefox sans fenêtre (False pour suivre la navigation à l'écran)
+MAPPING_CHECKPOINT_EVERY = 25  # Réécrire les mappings tous les N fichiers téléchargés
+CHUNK_SIZE = 1 << 16  # Écriture des réponses HTTP par blocs de 64 Ko
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
 
 # Limites en mode TEST
 TEST_MODE = False  # Sera activé par argument --test
@@ -37,6 +53,25 @@ TEST_MAX_REPOS = 1  # 1 seul répertoire principal
 TEST_MAX_SUBPAGES = 10  # Maximum 10 sous-pages
 TEST_MAX_FILES = 10  # Maximum 10 fichiers
 
+# Attribut href/src d'une balise ouvrante <a>, <link> ou <script> dans le HTML brut, en octets
+# (groupes : préfixe, balise, attribut, guillemet, valeur). Les valeurs entre guillemets des
+# autres attributs sont sautées en bloc, et Firefox écrit > en &gt; dans les attributs :
+# la recherche ne sort donc pas de la balise
+URL_ATTR_RE = re.compile(
+    rb'(<(a|link|script)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*?\s(href|src)\s*=\s*)(["\'])(.*?)\4',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Types de liens corrigés par fix_link (l'ordre des alternatives fixe la priorité)
+LINK_RE = re.compile(
+    r'(?P<keep>^#|^javascript:|^assets/|^fichiers/)'
+    r'|(?P<download>download\?id=(?P<file_id>[^&]+))'
+    r'|(?P<rep>(?:docs\?|^\?)rep=(?P<repo_id>[^&]+))'
+    r'|(?P<index>^(?:\.|\./|index|index\.html)$)'
+    r'|(?P<docs>^docs(?:\.html)?$)'
+    r'|(?P<dead>^(?:recent|agenda|mail|notescolles|prefs|blogcdp)$|^notescolles\?|^\.\?)'
+)
+
 def normalize_url(user_input):
     """
     Normalise l'URL saisie par l'utilisateur
@@ -69,18 +104,156 @@ def normalize_url(user_input):
     # On ajoute le préfixe complet
     return f'https://cahier-de-prepa.fr/{url}/'
 
+def format_size(size):
+    """Convertit une taille en octets en texte lisible (octets/Ko/Mo)"""
+    if size < 1024:
+        return f"{size} octets"
+    elif size < 1024 * 1024:
+        return f"{size // 1024} Ko"
+    return f"{size // (1024 * 1024)} Mo"
+
+class FilenameTable(dict):
+    """
+    Table str.translate pour les noms de fichiers : garde lettres (accentuées comprises),
+    chiffres, espaces et _-. ; retire le reste. Chaque caractère n'est évalué qu'une fois.
+    """
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        keep = char.isalnum() or char.isspace() or char in '_-.'
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+FILENAME_TABLE = FilenameTable()
+
+def sanitize_filename(title):
+    """Nettoie un titre pour en faire un nom de fichier valide (200 caractères max)"""
+    cleaned = title.translate(FILENAME_TABLE)
+    cleaned = ' '.join(cleaned.split())
+
+    # Limiter la longueur
+    if len(cleaned) > 200:
+        cleaned = cleaned[:197] + "..."
+    return cleaned
+
+def fix_link(href, link_text=""):
+    """Corrige un lien href"""
+    if not href:
+        return href
+
+    # Un seul passage de regex détermine le type de lien
+    match = LINK_RE.search(href)
+    if not match:
+        return href
+
+    kind = match.lastgroup
+
+    # Liens de téléchargement
+    if kind == 'download':
+        return f"fichiers/{match.group('file_id')}"
+
+    # Liens vers repos (docs?rep= ou ?rep= relatif)
+    if kind == 'rep':
+        return f"docs_rep_{match.group('repo_id')}.html"
+
+    # Liens vers pages spéciales
+    if kind == 'index':
+        return 'index.html'
+    if kind == 'docs':
+        return 'docs.html'
+
+    # Autres liens (agenda, mail, etc.) - pas disponibles hors ligne
+    if kind == 'dead':
+        return '#'
+
+    # Ancres, javascript: et fichiers déjà corrigés
+    return href
+
+
+def fix_html_file(html_file):
+    """
+    Corrige les liens d'un fichier HTML (exécuté dans un processus séparé)
+    Retourne (liens corrigés, assets corrigés, exemples pour les logs)
+    """
+    # Seules ces balises sont réécrites : inutile de construire le reste de l'arbre
+    only_rewritable = SoupStrainer(['a', 'link', 'script'])
+
+    html_content = html_file.read_bytes()
+    soup = BeautifulSoup(html_content, 'lxml', parse_only=only_rewritable, from_encoding='utf-8')
+
+    rewrites = {}  # (balise, attribut, ancienne valeur) -> nouvelle valeur
+    link_texts = {}  # ancien href -> texte du lien, pour les logs
+
+    # Corriger les liens CSS
+    for link in soup.find_all('link', rel='stylesheet'):
+        if link.get('href'):
+            old_href = link['href']
+            # Transformer css/style.min.css → assets/css/style.min.css
+            if old_href.startswith('css/'):
+                rewrites[('link', 'href', old_href)] = 'assets/' + old_href
+
+    # Corriger les scripts JS
+    for script in soup.find_all('script', src=True):
+        old_src = script['src']
+        # Transformer js/jquery.min.js → assets/js/jquery.min.js
+        if old_src.startswith('js/'):
+            rewrites[('script', 'src', old_src)] = 'assets/' + old_src
+
+    # Corriger les liens <a>
+    for a in soup.find_all('a', href=True):
+        old_href = a['href']
+        new_href = fix_link(old_href, a.get_text(strip=True))
+
+        if new_href != old_href:
+            rewrites[('a', 'href', old_href)] = new_href
+            link_texts.setdefault(old_href, a.get_text(strip=True)[:50])
+
+    links_fixed = 0
+    assets_fixed = 0
+    details = []
+
+    if rewrites:
+        # Appliquer les remplacements sur le HTML d'origine, laissé intact par ailleurs ;
+        # seuls les remplacements effectués sont comptés
+        def replace_attr(match):
+            nonlocal links_fixed, assets_fixed
+            tag = match.group(2).lower().decode('ascii')
+            value = html.unescape(match.group(5).decode('utf-8', errors='replace'))
+            key = (tag, match.group(3).lower().decode('ascii'), value)
+            if key not in rewrites:
+                return match.group(0)
+
+            new_value = rewrites[key]
+            if tag == 'a':
+                links_fixed += 1
+                # Garder quelques exemples pour les logs
+                if links_fixed <= 3:
+                    details.append(f"    • {value} → {new_value} (\"{link_texts[value]}\")")
+            else:
+                assets_fixed += 1
+
+            quote = match.group(4)
+            return match.group(1) + quote + html.escape(new_value).encode('utf-8') + quote
+
+        new_content = URL_ATTR_RE.sub(replace_attr, html_content)
+        if links_fixed > 0 or assets_fixed > 0:
+            html_file.write_bytes(new_content)
+
+    return links_fixed, assets_fixed, details
+
 class Logger:
     """Gestionnaire de logs détaillé"""
     def __init__(self, log_file):
         self.log_file = log_file
         self.start_time = datetime.now()
+        self.lock = threading.Lock()  # Lignes écrites depuis plusieurs threads
 
     def log(self, message, level="INFO"):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_line = f"[{timestamp}] {message}"
-        print(log_line)
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_line + "\n")
+        with self.lock:
+            print(log_line)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(log_line + "\n")
 
     def section(self, title):
         separator = "=" * 60
@@ -88,6 +261,28 @@ class Logger:
         self.log(f"  {title}")
         self.log(separator)
 
+class RateLimiter:
+    """Limite le rythme des requêtes : un jeton libéré à intervalle régulier"""
+    def __init__(self, interval, jitter=0.0):
+        self.interval = interval
+        self.jitter = jitter
+        self.tokens = threading.BoundedSemaphore(1)  # Au plus un jeton en réserve
+
+        refill = threading.Thread(target=self.refill, daemon=True)
+        refill.start()
+
+    def refill(self):
+        while True:
+            time.sleep(self.interval + random.uniform(0, self.jitter))
+            try:
+                self.tokens.release()
+            except ValueError:
+                pass  # Jeton déjà disponible
+
+    def acquire(self):
+        """Bloque jusqu'au prochain jeton disponible"""
+        self.tokens.acquire()
+
 class SiteDownloader:
     def __init__(self, email, password, base_url, output_dir, logger, test_mode=False):
         self.email = email
@@ -107,59 +302,111 @@ class SiteDownloader:
 
         # Tracking
         self.visited_repos = set()
+        self.repo_queue = queue.Queue()  # (repo_id, texte) restant à explorer
         self.repo_mapping = {}  # repo_id -> {fichier, nom_complet, url, texte_clique}
         self.file_mapping = {}  # file_id -> {fichier_reel, titre, repo}
+        self.pending_files = []  # (file_id, titre, repo) à télécharger après l'exploration
+        self.seen_files = set()
+        self.claimed_names = {}  # nom de fichier -> file_id qui l'utilise dans cette exécution
+        self.lock = threading.Lock()  # Protège compteurs et mappings entre threads
         self.downloaded_files_count = 0
+        self.cached_files_count = 0
         self.failed_files = []
         self.repos_explored = 0
         self.subpages_count = 0
 
+        # Rythme des requêtes HTTP, partagé par tous les threads
+        self.rate_limiter = RateLimiter(REQUEST_INTERVAL, REQUEST_JITTER)
+
         # Setup Selenium
         self.setup_driver()
 
+        # Session HTTP unique (keep-alive) pour les assets et les fichiers
+        self.setup_http_session()
+
+        # Cache des pages et fichiers déjà récupérés (reprise)
+        self.setup_cache()
+
     def setup_driver(self):
         """Configure Firefox avec Selenium"""
-        options = Options()
+        self.driver = self.create_driver()
+        self.wait = WebDriverWait(self.driver, 10)
 
-        # Configuration du téléchargement automatique
-        options.set_preference("browser.download.folderList", 2)  # 2 = dossier personnalisé
-        options.set_preference("browser.download.dir", str(DOWNLOAD_DIR))
-        options.set_preference("browser.download.useDownloadDir", True)
-        options.set_preference("browser.download.manager.showWhenStarting", False)
-        options.set_preference("browser.download.manager.closeWhenDone", True)
-        options.set_preference("browser.download.manager.focusWhenStarting", False)
-        options.set_preference("browser.download.manager.useWindow", False)
-        options.set_preference("browser.download.manager.showAlertOnComplete", False)
-
-        # Liste de tous les types MIME à télécharger sans demander
-        mime_types = [
-            "application/pdf",
-            "application/vnd.ms-excel",
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            "application/msword",
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            "application/zip",
-            "application/x-zip-compressed",
-            "application/octet-stream",
-            "text/plain",
-            "text/csv",
-            "application/vnd.ms-powerpoint",
-            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-            "image/jpeg",
-            "image/png",
-            "image/gif"
-        ]
-        options.set_preference("browser.helperApps.neverAsk.saveToDisk", ",".join(mime_types))
+    def create_driver(self):
+        """Lance une nouvelle instance de Firefox"""
+        options = Options()
 
-        # Désactiver la prévisualisation PDF intégrée
-        options.set_preference("pdfjs.disabled", True)
+        if HEADLESS:
+            options.add_argument("-headless")
+
+        # Le script ne fait que lire le DOM : pas d'images, un seul processus de contenu
+        options.set_preference("permissions.default.image", 2)
+        options.set_preference("javascript.options.showInConsole", False)
+        options.set_preference("dom.ipc.processCount", 1)
+
+        # Cache en mémoire uniquement, pour la durée de la session
+        options.set_preference("browser.cache.disk.enable", False)
+        options.set_preference("browser.cache.memory.enable", True)
+        options.set_preference("browser.cache.memory.capacity", 65536)
+
+        return webdriver.Firefox(options=options)
+
+    def clone_driver(self):
+        """Lance un Firefox supplémentaire qui partage la session du premier"""
+        driver = self.create_driver()
+        driver.set_page_load_timeout(30)
+        driver.get(self.base_url)  # Les cookies ne peuvent être ajoutés que sur leur domaine
+        for cookie in self.driver.get_cookies():
+            driver.add_cookie({
+                key: value for key, value in cookie.items()
+                if key in ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry')
+            })
+        driver.set_page_load_timeout(10)
+        return driver
+
+    def setup_http_session(self):
+        """Prépare la session HTTP partagée (connexions réutilisées)"""
+        self.http = requests.Session()
+        self.http.headers['User-Agent'] = USER_AGENT
+
+        # Pool de connexions partagé par les threads de téléchargement
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+
+    def setup_cache(self):
+        """Ouvre le cache SQLite qui permet de reprendre un téléchargement interrompu"""
+        self.cache = sqlite3.connect(self.output_dir / "cache.db", check_same_thread=False)
+        self.cache.execute("PRAGMA journal_mode=WAL")
+        with self.cache:
+            self.cache.execute(
+                "CREATE TABLE IF NOT EXISTS files (id TEXT PRIMARY KEY, path TEXT, size INT, mtime INT)"
+            )
+            self.cache.execute(
+                "CREATE TABLE IF NOT EXISTS repos (id TEXT PRIMARY KEY, filename TEXT, link_text TEXT)"
+            )
 
-        # Désactiver les popups de téléchargement
-        options.set_preference("browser.helperApps.alwaysAsk.force", False)
-        options.set_preference("browser.download.panel.shown", False)
+        # Reprendre le mapping des pages déjà sauvegardées
+        for repo_id, filename, link_text in self.cache.execute("SELECT id, filename, link_text FROM repos"):
+            if (self.output_dir / filename).exists():
+                self.repo_mapping[repo_id] = {
+                    "fichier": filename,
+                    "nom_complet": link_text,
+                    "url_originale": f"docs?rep={repo_id}",
+                    "texte_clique": link_text
+                }
 
-        self.driver = webdriver.Firefox(options=options)
-        self.wait = WebDriverWait(self.driver, 10)
+    def load_driver_cookies(self):
+        """Copie les cookies de session Selenium dans la session HTTP"""
+        for cookie in self.driver.get_cookies():
+            self.http.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie['domain'], path=cookie.get('path', '/')
+            )
 
     def login(self):
         """Connexion au site"""
@@ -177,7 +424,9 @@ class SiteDownloader:
                 EC.element_to_be_clickable((By.CLASS_NAME, "icon-connexion"))
             )
             connexion_button.click()
-            time.sleep(2)
+
+            # Attendre l'affichage du formulaire de connexion
+            wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[type='password']")))
 
             # Trouver les champs (avec plusieurs tentatives)
             email_field = None
@@ -203,18 +452,13 @@ class SiteDownloader:
 
             # Remplir les champs
             email_field.clear()
-            time.sleep(0.5)
             email_field.send_keys(self.email)
-            time.sleep(0.5)
 
             password_field.clear()
-            time.sleep(0.5)
             password_field.send_keys(self.password)
-            time.sleep(0.5)
 
             # Soumettre le formulaire
             password_field.submit()
-            time.sleep(5)
 
             # Vérifier que la connexion a réussi en cherchant l'icône de déconnexion
             try:
@@ -229,17 +473,14 @@ class SiteDownloader:
 
         except Exception as e:
             self.logger.log(f"Erreur de connexion : {e}")
-            import traceback
             self.logger.log(traceback.format_exc())
             return False
 
-    def save_page(self, repo_id=None, link_text="", url=""):
-        """Sauvegarde une page HTML"""
-        if repo_id and repo_id in self.visited_repos:
-            return None
+    def save_page(self, repo_id=None, link_text="", url="", driver=None, html_content=None):
+        """Sauvegarde une page HTML (html_content : source déjà lue, sinon lue depuis le navigateur)"""
+        driver = driver or self.driver
 
         if repo_id:
-            self.visited_repos.add(repo_id)
             filename = f"docs_rep_{repo_id}.html"
         else:
             filename = "docs.html" if "docs" in url else "index.html"
@@ -247,41 +488,44 @@ class SiteDownloader:
         filepath = self.output_dir / filename
 
         try:
-            # Attendre que la page soit complètement chargée
-            # On attend soit l'icône de déconnexion (si connecté) soit le contenu principal
-            wait = WebDriverWait(self.driver, 10)
-            try:
-                # Attendre l'un de ces éléments
-                wait.until(lambda driver:
-                    driver.find_elements(By.CLASS_NAME, "icon-deconnexion") or
-                    driver.find_elements(By.TAG_NAME, "section")
-                )
-            except TimeoutException:
-                pass  # Continuer même si timeout
-
-            time.sleep(2)  # Attendre encore 2 secondes pour être sûr
+            if html_content is None:
+                # Attendre que la page soit complètement chargée
+                # On attend soit l'icône de déconnexion (si connecté) soit le contenu principal
+                wait = WebDriverWait(driver, 10)
+                try:
+                    # Attendre l'un de ces éléments
+                    wait.until(lambda driver:
+                        driver.find_elements(By.CLASS_NAME, "icon-deconnexion") or
+                        driver.find_elements(By.TAG_NAME, "section")
+                    )
+                except TimeoutException:
+                    pass  # Continuer même si timeout
 
-            html_content = self.driver.page_source
+                html_content = driver.page_source
 
             # Vérifier que la page ne contient pas le formulaire de connexion
             if 'icon-connexion' in html_content and 'icon-deconnexion' not in html_content:
                 self.logger.log(f"  ⚠️  Page non connectée détectée pour {filename} - abandon")
                 return None
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            filepath.write_bytes(html_content.encode('utf-8', errors='replace'))
 
             if repo_id:
                 self.logger.log(f"  → Texte cliqué: \"{link_text}\"")
                 self.logger.log(f"  → Page sauvegardée: {filename}")
 
                 # Enregistrer le mapping
-                self.repo_mapping[repo_id] = {
-                    "fichier": filename,
-                    "nom_complet": link_text,
-                    "url_originale": f"docs?rep={repo_id}",
-                    "texte_clique": link_text
-                }
+                with self.lock, self.cache:
+                    self.repo_mapping[repo_id] = {
+                        "fichier": filename,
+                        "nom_complet": link_text,
+                        "url_originale": f"docs?rep={repo_id}",
+                        "texte_clique": link_text
+                    }
+                    self.cache.execute(
+                        "INSERT OR REPLACE INTO repos (id, filename, link_text) VALUES (?, ?, ?)",
+                        (repo_id, filename, link_text)
+                    )
             else:
                 self.logger.log(f"  → Page sauvegardée: {filename}")
 
@@ -292,237 +536,310 @@ class SiteDownloader:
             return None
 
     def download_file(self, file_id, title, repo_name=""):
-        """Télécharge un fichier"""
-        # Vérifier la limite en mode test
-        if self.test_mode and self.downloaded_files_count >= TEST_MAX_FILES:
-            self.logger.log(f"  ⚠️  LIMITE TEST atteinte ({TEST_MAX_FILES} fichiers) - Fichier ignoré: {file_id}")
-            return False
-
+        """Télécharge un fichier via la session HTTP authentifiée"""
         download_url = f"{self.base_url}download?id={file_id}"
 
-        try:
-            # Nettoyer le titre pour en faire un nom de fichier valide
-            safe_title = re.sub(r'[^\w\s\-\.]', '', title)
-            safe_title = re.sub(r'\s+', ' ', safe_title).strip()
-
-            # Limiter la longueur (max 200 caractères)
-            if len(safe_title) > 200:
-                safe_title = safe_title[:197] + "..."
-
-            self.logger.log(f"  → Fichier trouvé: {file_id} - \"{title}\"")
-
-            # Noter les fichiers existants AVANT le téléchargement
-            import glob
-            before_files = set(glob.glob(str(DOWNLOAD_DIR / "*")))
-            before_time = time.time()
-
-            # Lancer le téléchargement avec Selenium
-            # Note: le get() va timeout car c'est un téléchargement, pas une page web
-            # C'est normal et attendu - on capture l'exception
-            try:
-                self.driver.set_page_load_timeout(5)  # Court timeout
-                self.driver.get(download_url)
-            except TimeoutException:
-                pass  # Normal pour un téléchargement de fichier
-            finally:
-                self.driver.set_page_load_timeout(10)  # Restaurer le timeout normal
-
-            time.sleep(3)  # Attendre que le téléchargement démarre
+        # Téléchargement dans un fichier temporaire propre à cet id
+        tmp_path = self.fichiers_dir / f".{file_id}.part"
 
-            # Chercher les NOUVEAUX fichiers téléchargés
-            max_wait = 30
-            latest_file = None
-
-            for _ in range(max_wait):
-                after_files = set(glob.glob(str(DOWNLOAD_DIR / "*")))
-                new_files = after_files - before_files
+        try:
+            # Fichier déjà récupéré lors d'une exécution précédente ?
+            with self.lock:
+                cached = self.cache.execute("SELECT path, size FROM files WHERE id = ?", (file_id,)).fetchone()
+            if cached and self.use_cached_file(file_id, title, repo_name, *cached):
+                return True
 
-                if new_files:
-                    # Prendre le fichier le plus récent parmi les nouveaux
-                    new_files_list = list(new_files)
-                    new_files_list.sort(key=os.path.getmtime, reverse=True)
-                    latest_file = Path(new_files_list[0])
+            # Nettoyer le titre pour en faire un nom de fichier valide
+            safe_title = sanitize_filename(title)
 
-                    # Vérifier que le fichier a été modifié après le début du téléchargement
-                    if os.path.getmtime(latest_file) >= before_time:
-                        break
+            self.rate_limiter.acquire()
+            with self.http.get(download_url, stream=True, timeout=60) as response:
+                response.raise_for_status()
 
-                time.sleep(1)
+                # Déterminer l'extension depuis le nom fourni par le serveur
+                # (filename="..." ou filename*=UTF-8''...)
+                disposition = response.headers.get('Content-Disposition', '')
+                match = re.search(r'filename\*?="?([^";]+)', disposition)
+                if not match and 'text/html' in response.headers.get('Content-Type', ''):
+                    raise Exception("Page HTML reçue au lieu du fichier (session expirée ?)")
+                server_name = unquote(match.group(1).split("''")[-1]) if match else ""
+                file_ext = Path(server_name).suffix
+
+                # Ajouter l'extension si nécessaire
+                if not safe_title.endswith(file_ext) and file_ext:
+                    safe_title += file_ext
+
+                # Écrire par morceaux, puis déplacer une fois le fichier complet
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+
+            # Deux documents peuvent porter le même titre : un nom distinct par id
+            safe_title = self.claim_filename(file_id, safe_title)
+            file_path = self.fichiers_dir / safe_title
+            os.replace(tmp_path, file_path)
 
-            if not latest_file:
-                raise Exception("Aucun nouveau fichier téléchargé trouvé")
+            file_stat = file_path.stat()
+            size_str = format_size(file_stat.st_size)
 
-            # Attendre que le téléchargement se termine (pas de .part)
-            wait_count = 0
-            while latest_file.suffix == '.part' and wait_count < 30:
-                time.sleep(1)
-                wait_count += 1
+            self.logger.log(f"  → Téléchargement: {safe_title} ({size_str}) [OK]")
 
-            if latest_file.suffix == '.part':
-                raise Exception("Téléchargement incomplet")
+            # Créer le lien symbolique
+            self.link_file(file_id, safe_title)
 
-            # Déterminer l'extension depuis le fichier téléchargé
-            file_ext = latest_file.suffix
-            if not file_ext:
-                file_ext = ""
+            self.logger.log(f"  → Lien symbolique: fichiers/{file_id} -> {safe_title}")
 
-            # Ajouter l'extension si nécessaire
-            if not safe_title.endswith(file_ext) and file_ext:
-                safe_title += file_ext
+            # Enregistrer le mapping
+            with self.lock:
+                self.file_mapping[file_id] = {
+                    "fichier_reel": safe_title,
+                    "lien_symbolique": file_id,
+                    "titre": title,
+                    "repository": repo_name,
+                    "taille": size_str
+                }
+                self.downloaded_files_count += 1
+                if self.downloaded_files_count % MAPPING_CHECKPOINT_EVERY == 0:
+                    self.write_mappings()  # Point de sauvegarde en cas d'interruption
+                with self.cache:
+                    self.cache.execute(
+                        "INSERT OR REPLACE INTO files (id, path, size, mtime) VALUES (?, ?, ?, ?)",
+                        (file_id, safe_title, file_stat.st_size, int(file_stat.st_mtime))
+                    )
 
-            # Déplacer le fichier vers le dossier final
-            file_path = self.fichiers_dir / safe_title
-            shutil.move(str(latest_file), str(file_path))
+            return True
 
-            file_size = file_path.stat().st_size
+        except Exception as e:
+            self.logger.log(f"  ⚠️  Échec téléchargement {file_id}: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            with self.lock:
+                self.failed_files.append({"id": file_id, "titre": title, "erreur": str(e)})
+            return False
 
-            # Convertir la taille en Ko/Mo
-            if file_size < 1024:
-                size_str = f"{file_size} octets"
-            elif file_size < 1024 * 1024:
-                size_str = f"{file_size // 1024} Ko"
-            else:
-                size_str = f"{file_size // (1024 * 1024)} Mo"
+    def claim_filename(self, file_id, filename):
+        """Réserve un nom de fichier pour cet id, en ajoutant _<id> s'il est déjà pris"""
+        with self.lock:
+            owner = self.claimed_names.get(filename)
+            if owner is None:
+                # Nom attribué à un autre id lors d'une exécution précédente ?
+                row = self.cache.execute(
+                    "SELECT id FROM files WHERE path = ? AND id != ?", (filename, file_id)
+                ).fetchone()
+                owner = row[0] if row else file_id
+
+            if owner != file_id:
+                name = Path(filename)
+                filename = f"{name.stem}_{file_id}{name.suffix}"
+
+            self.claimed_names[filename] = file_id
+            return filename
+
+    def link_file(self, file_id, filename):
+        """Crée (ou corrige) le lien symbolique fichiers/<id> vers le fichier réel"""
+        link_path = self.fichiers_dir / file_id
+        if link_path.is_symlink() and os.readlink(link_path) == filename:
+            return
+        if link_path.exists() or link_path.is_symlink():
+            link_path.unlink()
+        link_path.symlink_to(filename)
+
+    def use_cached_file(self, file_id, title, repo_name, filename, size):
+        """Réutilise un fichier du cache s'il est toujours complet sur le disque"""
+        file_path = self.fichiers_dir / filename
+        if not file_path.is_file() or file_path.stat().st_size != size:
+            return False
 
-            self.logger.log(f"  → Téléchargement: {safe_title} ({size_str}) [OK]")
+        # Le nom a pu être repris par un autre id dans cette exécution : retélécharger
+        if self.claim_filename(file_id, filename) != filename:
+            return False
 
-            # Créer le lien symbolique
-            link_path = self.fichiers_dir / file_id
-            if link_path.exists():
-                link_path.unlink()
-            link_path.symlink_to(safe_title)
+        size_str = format_size(size)
+        self.logger.log(f"  → En cache: {filename} ({size_str})")
 
-            self.logger.log(f"  → Lien symbolique: fichiers/{file_id} -> {safe_title}")
+        self.link_file(file_id, filename)
 
-            # Enregistrer le mapping
+        with self.lock:
             self.file_mapping[file_id] = {
-                "fichier_reel": safe_title,
+                "fichier_reel": filename,
                 "lien_symbolique": file_id,
                 "titre": title,
                 "repository": repo_name,
                 "taille": size_str
             }
+            self.cached_files_count += 1
+        return True
 
-            self.downloaded_files_count += 1
-            time.sleep(WAIT_TIME)
-            return True
+    def download_pending_files(self):
+        """Télécharge en parallèle les fichiers repérés pendant l'exploration"""
+        self.logger.section("TÉLÉCHARGEMENT DES FICHIERS")
 
-        except Exception as e:
-            self.logger.log(f"  ⚠️  Échec téléchargement {file_id}: {e}")
-            self.failed_files.append({"id": file_id, "titre": title, "erreur": str(e)})
-            return False
+        files = self.pending_files
+        if self.test_mode and len(files) > TEST_MAX_FILES:
+            for file_id, _, _ in files[TEST_MAX_FILES:]:
+                self.logger.log(f"  ⚠️  LIMITE TEST atteinte ({TEST_MAX_FILES} fichiers) - Fichier ignoré: {file_id}")
+            files = files[:TEST_MAX_FILES]
 
-    def explore_repository(self, repo_id, link_text):
-        """Explore un répertoire et télécharge son contenu"""
-        # Vérifier la limite de sous-pages en mode test
-        if self.test_mode and self.subpages_count >= TEST_MAX_SUBPAGES:
-            self.logger.log(f"  ⚠️  LIMITE TEST atteinte ({TEST_MAX_SUBPAGES} sous-pages) - Repo ignoré: {repo_id}")
-            return
+        self.logger.log(f"{len(files)} fichiers à télécharger ({DOWNLOAD_WORKERS} en parallèle)\n")
 
-        self.subpages_count += 1
-        self.logger.log(f"Exploration du repo {repo_id} [{self.subpages_count}/{TEST_MAX_SUBPAGES if self.test_mode else '∞'}]")
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            list(executor.map(lambda item: self.download_file(*item), files))
 
+    def explore_worker(self, driver):
+        """Explore les répertoires de la file d'attente avec un navigateur"""
+        while True:
+            item = self.repo_queue.get()
+            try:
+                if item is None:
+                    return
+                self.explore_repository(driver, *item)
+            except Exception as e:
+                self.logger.log(f"  ⚠️  Erreur exploration repo {item[0]}: {e}")
+            finally:
+                self.repo_queue.task_done()
+
+    def explore_repository(self, driver, repo_id, link_text):
+        """Explore un répertoire et ajoute ses sous-répertoires à la file d'attente"""
+        with self.lock:
+            # Ne pas recharger un répertoire déjà visité (avant toute navigation)
+            if repo_id in self.visited_repos:
+                return
+            self.visited_repos.add(repo_id)
+
+            # Vérifier la limite de sous-pages en mode test
+            if self.test_mode and self.subpages_count >= TEST_MAX_SUBPAGES:
+                self.logger.log(f"  ⚠️  LIMITE TEST atteinte ({TEST_MAX_SUBPAGES} sous-pages) - Repo ignoré: {repo_id}")
+                return
+
+            self.subpages_count += 1
+            self.logger.log(f"Exploration du repo {repo_id} [{self.subpages_count}/{TEST_MAX_SUBPAGES if self.test_mode else '∞'}]")
+
+        # driver.get() rend la main après l'événement load ; la liste des
+        # sous-répertoires et fichiers est rendue côté serveur, donc déjà présente
         url = f"{self.base_url}docs?rep={repo_id}"
-        self.driver.get(url)
+        driver.get(url)
 
-        # Attendre que la page soit complètement chargée
-        try:
-            # Attendre qu'un élément caractéristique soit présent (signe que c'est bien chargé)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "section"))
-            )
-            time.sleep(2)  # Temps supplémentaire pour le rendu complet
-        except:
-            self.logger.log(f"  ⚠️  Timeout chargement page {repo_id}")
-            time.sleep(1)
+        # Une seule copie du DOM sert à la sauvegarde et à l'extraction des liens,
+        # plutôt qu'un aller-retour WebDriver par lien et par attribut
+        html_content = driver.page_source
 
         # Sauvegarder la page
-        self.save_page(repo_id, link_text, url)
+        self.save_page(repo_id, link_text, url, driver=driver, html_content=html_content)
 
-        # Trouver tous les sous-répertoires
-        try:
-            sub_repos = self.driver.find_elements(By.CSS_SELECTOR, "p.rep a")
-            sub_repo_list = []
-            for repo_link in sub_repos:
-                href = repo_link.get_attribute('href')
-                if 'rep=' in href:
-                    sub_id = href.split('rep=')[-1].split('&')[0]
-                    text = repo_link.text.strip()
-                    sub_repo_list.append((sub_id, text))
-        except:
-            sub_repo_list = []
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=SoupStrainer('p'))
+
+        # Ajouter les sous-répertoires à la file d'attente
+        for repo_link in soup.select('p.rep a[href*="rep="]'):
+            sub_id = repo_link['href'].split('rep=')[-1].split('&')[0]
+            if sub_id not in self.visited_repos:
+                self.repo_queue.put((sub_id, repo_link.get_text(' ', strip=True)))
 
         # Trouver tous les fichiers
+        for file_link in soup.select('p.doc a[href*="download?id="]'):
+            file_id = file_link['href'].split('id=')[-1].split('&')[0]
+            title = file_link.get_text(' ', strip=True)
+            with self.lock:
+                if file_id in self.seen_files:
+                    continue
+                self.seen_files.add(file_id)
+                self.pending_files.append((file_id, title, link_text))
+            self.logger.log(f"  → Fichier trouvé: {file_id} - \"{title}\"")
+
+    def explore_all(self, main_repos):
+        """Explore les répertoires en largeur, avec plusieurs navigateurs si possible"""
+        for repo_id, text in main_repos.items():
+            # Limite en mode test
+            if self.test_mode and self.repos_explored >= TEST_MAX_REPOS:
+                self.logger.log(f"\n⚠️  LIMITE TEST atteinte ({TEST_MAX_REPOS} répertoire principal)")
+                self.logger.log(f"Repos ignorés: {len(main_repos) - self.repos_explored}")
+                break
+
+            self.logger.log(f"RÉPERTOIRE PRINCIPAL {self.repos_explored + 1}/{TEST_MAX_REPOS if self.test_mode else len(main_repos)}: {text}")
+            self.repo_queue.put((repo_id, text))
+            self.repos_explored += 1
+
+        # Navigateurs supplémentaires, connectés avec les cookies du premier
+        drivers = [self.driver]
         try:
-            files = self.driver.find_elements(By.CSS_SELECTOR, "p.doc a")
-            for file_link in files:
-                href = file_link.get_attribute('href')
-                if 'download?id=' in href:
-                    file_id = href.split('id=')[-1].split('&')[0]
-                    title = file_link.text.strip()
-                    self.download_file(file_id, title, link_text)
-        except:
-            pass
-
-        # Explorer les sous-répertoires récursivement
-        for sub_id, sub_text in sub_repo_list:
-            if sub_id not in self.visited_repos:
-                self.explore_repository(sub_id, sub_text)
+            for _ in range(min(EXPLORE_WORKERS, 4) - 1):
+                try:
+                    drivers.append(self.clone_driver())
+                except Exception as e:
+                    self.logger.log(f"  ⚠️  Navigateur supplémentaire indisponible: {e}")
+                    break
+
+            self.logger.log(f"\nExploration avec {len(drivers)} navigateur(s)\n")
+
+            workers = [
+                threading.Thread(target=self.explore_worker, args=(driver,), daemon=True)
+                for driver in drivers
+            ]
+            for worker in workers:
+                worker.start()
+
+            # Attendre que la file soit vide, puis arrêter les threads
+            self.repo_queue.join()
+            for _ in workers:
+                self.repo_queue.put(None)
+            for worker in workers:
+                worker.join()
+        finally:
+            # Toujours fermer les navigateurs supplémentaires (Ctrl+C, erreur...)
+            for driver in drivers[1:]:
+                try:
+                    driver.quit()
+                except Exception as e:
+                    self.logger.log(f"  ⚠️  Fermeture navigateur: {e}")
 
     def download_all(self):
         """Télécharge tout le site"""
         self.logger.section("DÉBUT DU TÉLÉCHARGEMENT")
 
-        if not self.login():
-            return False
-
-        # Aller sur la page docs
-        self.driver.get(f"{self.base_url}docs")
-        time.sleep(1)
-
-        # Sauvegarder la page d'accueil et docs
-        self.driver.get(self.base_url)
-        time.sleep(1)
-        self.save_page(url=self.base_url)
+        try:
+            if not self.login():
+                return False
 
-        self.driver.get(f"{self.base_url}docs")
-        time.sleep(1)
-        self.save_page(url=f"{self.base_url}docs")
+            self.load_driver_cookies()
 
-        # Trouver tous les répertoires principaux
-        main_repos = []
-        try:
-            menu = self.driver.find_element(By.ID, "menu")
-            repo_links = menu.find_elements(By.CSS_SELECTOR, "a.menurep")
-
-            for link in repo_links:
-                href = link.get_attribute('href')
-                if 'rep=' in href:
-                    repo_id = href.split('rep=')[-1].split('&')[0]
-                    text = link.text.strip()
-                    main_repos.append((repo_id, text))
-        except Exception as e:
-            self.logger.log(f"Erreur extraction menu: {e}")
+            # Sauvegarder la page d'accueil puis docs (une seule visite chacune)
+            for url in (self.base_url, f"{self.base_url}docs"):
+                self.driver.get(url)
+                try:
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.ID, "menu"))
+                    )
+                except TimeoutException:
+                    self.logger.log(f"  ⚠️  Menu absent sur {url}")
+                self.save_page(url=url)
+
+            # Trouver tous les répertoires principaux
+            main_repos = {}  # repo_id -> texte (un même repo peut apparaître plusieurs fois)
+            try:
+                menu = self.driver.find_element(By.ID, "menu")
+                repo_links = menu.find_elements(By.CSS_SELECTOR, "a.menurep")
+
+                for link in repo_links:
+                    href = link.get_attribute('href')
+                    if 'rep=' in href:
+                        repo_id = href.split('rep=')[-1].split('&')[0]
+                        if repo_id not in main_repos:
+                            main_repos[repo_id] = link.text.strip()
+            except Exception as e:
+                self.logger.log(f"Erreur extraction menu: {e}")
 
-        self.logger.log(f"\n{len(main_repos)} répertoires principaux trouvés\n")
+            self.logger.log(f"\n{len(main_repos)} répertoires principaux trouvés\n")
 
-        # Explorer chaque répertoire
-        for repo_id, text in main_repos:
-            # Limite en mode test
-            if self.test_mode and self.repos_explored >= TEST_MAX_REPOS:
-                self.logger.log(f"\n⚠️  LIMITE TEST atteinte ({TEST_MAX_REPOS} répertoire principal)")
-                self.logger.log(f"Repos ignorés: {len(main_repos) - self.repos_explored}")
-                break
+            # Explorer tous les répertoires
+            self.explore_all(main_repos)
 
-            if repo_id not in self.visited_repos:
-                self.logger.log(f"\n{'='*60}")
-                self.logger.log(f"RÉPERTOIRE PRINCIPAL {self.repos_explored + 1}/{TEST_MAX_REPOS if self.test_mode else len(main_repos)}: {text}")
-                self.logger.log(f"{'='*60}\n")
-                self.explore_repository(repo_id, text)
-                self.repos_explored += 1
+            # Télécharger tous les fichiers repérés
+            self.download_pending_files()
 
-        self.driver.quit()
-        return True
+            return True
+        finally:
+            # Ne pas laisser Firefox (sans fenêtre) tourner après une interruption
+            self.driver.quit()
+            self.cache.close()
 
     def download_assets(self):
         """Télécharge les CSS, JS et fonts"""
@@ -537,20 +854,45 @@ class SiteDownloader:
         ]
 
         for asset_type, filename, url in assets:
+            filepath = self.assets_dir / asset_type / filename
+            tmp_path = filepath.with_name(filename + ".part")
+
             try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
+                # Requête conditionnelle : le serveur répond 304 si l'asset n'a pas changé
+                headers = {}
+                if filepath.exists():
+                    headers['If-Modified-Since'] = formatdate(filepath.stat().st_mtime, usegmt=True)
+
+                self.rate_limiter.acquire()
+                with self.http.get(url, timeout=30, stream=True, headers=headers) as response:
+                    if response.status_code == 304:
+                        self.logger.log(f"  → {asset_type.upper()}: {filename} inchangé [OK]")
+                        continue
+                    response.raise_for_status()
+
+                    # Écrire la réponse par blocs, sans la charger entièrement en mémoire
+                    size = 0
+                    with open(tmp_path, 'wb') as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
+                            size += len(chunk)
 
-                filepath = self.assets_dir / asset_type / filename
-                with open(filepath, 'wb') as f:
-                    f.write(response.content)
+                    last_modified = response.headers.get('Last-Modified')
 
-                size = len(response.content)
-                size_str = f"{size // 1024} Ko" if size >= 1024 else f"{size} octets"
-                self.logger.log(f"  → {asset_type.upper()}: {filename} ({size_str}) [OK]")
+                # Reprendre la date du serveur pour la prochaine requête conditionnelle
+                if last_modified:
+                    mtime = parsedate_to_datetime(last_modified).timestamp()
+                    os.utime(tmp_path, (mtime, mtime))
+
+                # Remplacer l'asset seulement une fois la réponse complète
+                os.replace(tmp_path, filepath)
+
+                self.logger.log(f"  → {asset_type.upper()}: {filename} ({format_size(size)}) [OK]")
 
             except Exception as e:
                 self.logger.log(f"  ⚠️  Erreur {filename}: {e}")
+                if tmp_path.exists():
+                    tmp_path.unlink()
 
     def fix_html_links(self):
         """Corrige tous les liens dans tous les fichiers HTML"""
@@ -560,50 +902,18 @@ class SiteDownloader:
         total_links = 0
         total_assets = 0
 
-        for html_file in html_files:
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    soup = BeautifulSoup(f.read(), 'html.parser')
-
-                links_fixed = 0
-                assets_fixed = 0
-                details = []
-
-                # Corriger les liens CSS
-                for link in soup.find_all('link', rel='stylesheet'):
-                    if link.get('href'):
-                        old_href = link['href']
-                        # Transformer css/style.min.css → assets/css/style.min.css
-                        if old_href.startswith('css/'):
-                            link['href'] = 'assets/' + old_href
-                            assets_fixed += 1
-
-                # Corriger les scripts JS
-                for script in soup.find_all('script', src=True):
-                    old_src = script['src']
-                    # Transformer js/jquery.min.js → assets/js/jquery.min.js
-                    if old_src.startswith('js/'):
-                        script['src'] = 'assets/' + old_src
-                        assets_fixed += 1
-
-                # Corriger les liens <a>
-                for a in soup.find_all('a', href=True):
-                    old_href = a['href']
-                    new_href = self.fix_link(old_href, a.get_text(strip=True))
-
-                    if new_href != old_href:
-                        a['href'] = new_href
-                        links_fixed += 1
-
-                        # Garder quelques exemples pour les logs
-                        if links_fixed <= 3:
-                            link_text = a.get_text(strip=True)[:50]
-                            details.append(f"    • {old_href} → {new_href} (\"{link_text}\")")
+        # Chaque fichier est indépendant : répartir le travail sur tous les cœurs
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(fix_html_file, html_file) for html_file in html_files]
 
-                if links_fixed > 0 or assets_fixed > 0:
-                    with open(html_file, 'w', encoding='utf-8') as f:
-                        f.write(str(soup))
+            for html_file, future in zip(html_files, futures):
+                try:
+                    links_fixed, assets_fixed, details = future.result()
+                except Exception as e:
+                    self.logger.log(f"  ⚠️  Erreur {html_file.name}: {e}")
+                    continue
 
+                if links_fixed > 0 or assets_fixed > 0:
                     if assets_fixed > 0:
                         self.logger.log(f"  → {html_file.name}: {assets_fixed} assets + {links_fixed} liens corrigés")
                     else:
@@ -617,63 +927,22 @@ class SiteDownloader:
                     total_links += links_fixed
                     total_assets += assets_fixed
 
-            except Exception as e:
-                self.logger.log(f"  ⚠️  Erreur {html_file.name}: {e}")
-
         self.logger.log(f"\nTotal: {total_assets} assets + {total_links} liens corrigés dans {len(html_files)} fichiers")
 
-    def fix_link(self, href, link_text=""):
-        """Corrige un lien href"""
-        if not href or href.startswith('#') or href.startswith('javascript:'):
-            return href
-
-        # Fichiers déjà corrigés
-        if href.startswith('assets/') or href.startswith('fichiers/'):
-            return href
-
-        # Liens de téléchargement
-        if 'download?id=' in href:
-            file_id = href.split('id=')[-1].split('&')[0]
-            return f"fichiers/{file_id}"
-
-        # Liens vers repos avec docs?rep=
-        if 'docs?rep=' in href:
-            repo_id = href.split('rep=')[-1].split('&')[0]
-            return f"docs_rep_{repo_id}.html"
-
-        # Liens vers repos avec ?rep= (relatif)
-        if href.startswith('?rep='):
-            repo_id = href.split('rep=')[-1].split('&')[0]
-            return f"docs_rep_{repo_id}.html"
-
-        # Liens vers pages spéciales
-        if href in ['.', './', 'index', 'index.html']:
-            return 'index.html'
-        if href in ['docs', 'docs.html']:
-            return 'docs.html'
-
-        # Autres liens (agenda, mail, etc.) - pas disponibles hors ligne
-        if href in ['recent', 'agenda', 'mail', 'notescolles', 'prefs', 'blogcdp']:
-            return '#'
-        if href.startswith('notescolles?') or href.startswith('.?'):
-            return '#'
+    def write_mappings(self):
+        """Écrit les fichiers de mapping (appelé aussi en cours de téléchargement)"""
+        mapping_pages_file = self.output_dir / "mapping_pages.json"
+        mapping_pages_file.write_bytes(orjson.dumps(self.repo_mapping, option=orjson.OPT_INDENT_2))
 
-        return href
+        mapping_fichiers_file = self.output_dir / "mapping_fichiers.json"
+        mapping_fichiers_file.write_bytes(orjson.dumps(self.file_mapping, option=orjson.OPT_INDENT_2))
 
     def save_mappings(self):
         """Sauvegarde les fichiers de mapping"""
         self.logger.section("SAUVEGARDE DES MAPPINGS")
 
-        # Mapping des pages
-        mapping_pages_file = self.output_dir / "mapping_pages.json"
-        with open(mapping_pages_file, 'w', encoding='utf-8') as f:
-            json.dump(self.repo_mapping, f, indent=2, ensure_ascii=False)
+        self.write_mappings()
         self.logger.log(f"  → mapping_pages.json: {len(self.repo_mapping)} entrées")
-
-        # Mapping des fichiers
-        mapping_fichiers_file = self.output_dir / "mapping_fichiers.json"
-        with open(mapping_fichiers_file, 'w', encoding='utf-8') as f:
-            json.dump(self.file_mapping, f, indent=2, ensure_ascii=False)
         self.logger.log(f"  → mapping_fichiers.json: {len(self.file_mapping)} entrées")
 
     def print_summary(self):
@@ -688,6 +957,7 @@ class SiteDownloader:
 
         self.logger.log(f"Pages HTML téléchargées: {html_count}")
         self.logger.log(f"Fichiers téléchargés: {self.downloaded_files_count}")
+        self.logger.log(f"Fichiers déjà en cache: {self.cached_files_count}")
         self.logger.log(f"Fichiers échoués: {len(self.failed_files)}")
         self.logger.log(f"Durée totale: {minutes}m {seconds:02d}s")
 
@@ -790,7 +1060,6 @@ def main():
         logger.log(f"  {OUTPUT_DIR}")
     except Exception as e:
         logger.log(f"\n\n❌ Erreur fatale: {e}")
-        import traceback
         logger.log(traceback.format_exc())
 
 if __name__ == "__main__":